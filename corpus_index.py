@@ -0,0 +1,519 @@
+import argparse
+import re
+import sqlite3
+from pathlib import Path
+
+DEFAULT_INDEX_PATH = "index.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    source TEXT NOT NULL,
+    format TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    doc_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    self_ref TEXT,
+    parent_id INTEGER,
+    item_type TEXT NOT NULL,
+    page_no INTEGER,
+    l REAL,
+    b REAL,
+    r REAL,
+    t REAL,
+    num_rows INTEGER,
+    num_cols INTEGER,
+    row INTEGER,
+    col INTEGER,
+    text TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS documents_name_key ON documents(name, key);
+CREATE INDEX IF NOT EXISTS items_doc_page ON items(doc_id, page_no);
+CREATE INDEX IF NOT EXISTS items_doc_type_page ON items(doc_id, item_type, page_no);
+CREATE INDEX IF NOT EXISTS items_page ON items(page_no);
+CREATE INDEX IF NOT EXISTS items_type_page ON items(item_type, page_no);
+CREATE INDEX IF NOT EXISTS items_shape ON items(num_rows, num_cols);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5(text, tokenize = 'unicode61');
+
+-- Spatial index over item bboxes so region queries don't scan every item
+CREATE VIRTUAL TABLE IF NOT EXISTS items_bbox USING rtree(id, l, r, b, t);
+"""
+
+# Keyword and region filters matching more items than this are checked per item
+SELECTIVE_MATCH_LIMIT = 10_000
+
+# Markdown exports have no layout information, so only item type, text and
+# table shape are recorded for them
+MD_TABLE_SEPARATOR = re.compile(r"^\|?\s*:?-{3,}:?\s*(\|\s*:?-{3,}:?\s*)*\|?$")
+
+
+def open_index(index_path: str | Path = DEFAULT_INDEX_PATH) -> sqlite3.Connection:
+    """Open (and create if needed) the on-disk index"""
+    conn = sqlite3.connect(Path(index_path).as_posix())
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+# Item extraction
+def _bbox_bottom_left(document, bbox, page_no):
+    """Return (l, b, r, t) of a box in bottom-left page coordinates
+
+    Top-left boxes (e.g. TableFormer cells) need the page height to be flipped;
+    when the page size is unknown None is returned and the item has no bbox.
+    """
+    if bbox.coord_origin.value != "BOTTOMLEFT":
+        page = document.pages.get(page_no)
+        if page is None or page.size is None:
+            return None
+        bbox = bbox.to_bottom_left_origin(page_height=page.size.height)
+    return bbox.l, bbox.b, bbox.r, bbox.t
+
+
+def _set_bbox(row, bbox):
+    if bbox is not None:
+        row["l"], row["b"], row["r"], row["t"] = bbox
+
+
+def items_from_docling(document):
+    """Yield index rows for the text items, tables and table cells of a DoclingDocument"""
+
+    for text in document.texts:
+        if not text.text:
+            continue
+
+        row = {
+            "self_ref": text.self_ref,
+            "item_type": text.label.value,
+            "text": text.text,
+        }
+        if text.prov:
+            prov = text.prov[0]
+            row["page_no"] = prov.page_no
+            _set_bbox(row, _bbox_bottom_left(document, prov.bbox, prov.page_no))
+        yield row, []
+
+    for table in document.tables:
+        if table.data is None:
+            continue
+
+        num_rows, num_cols = table.data.num_rows, table.data.num_cols
+        page_no = table.prov[0].page_no if table.prov else None
+
+        table_row = {
+            "self_ref": table.self_ref,
+            "item_type": table.label.value,
+            "num_rows": num_rows,
+            "num_cols": num_cols,
+            "text": " ".join(cell.text for cell in table.data.table_cells if cell.text),
+        }
+        if table.prov:
+            table_row["page_no"] = page_no
+            _set_bbox(table_row, _bbox_bottom_left(document, table.prov[0].bbox, page_no))
+
+        cells = []
+        for cell in table.data.table_cells:
+            if not cell.text:
+                continue
+
+            cell_row = {
+                "item_type": "table_cell",
+                "page_no": page_no,
+                "num_rows": num_rows,
+                "num_cols": num_cols,
+                "row": cell.start_row_offset_idx,
+                "col": cell.start_col_offset_idx,
+                "text": cell.text,
+            }
+            if cell.bbox is not None and page_no is not None:
+                _set_bbox(cell_row, _bbox_bottom_left(document, cell.bbox, page_no))
+            cells.append(cell_row)
+
+        yield table_row, cells
+
+
+def _split_md_row(line: str) -> list[str]:
+    return [cell.strip() for cell in line.strip().strip("|").split("|")]
+
+
+def items_from_markdown(markdown: str):
+    """Yield index rows for the paragraphs, headings and tables of a Markdown export"""
+
+    lines = markdown.splitlines()
+    i = 0
+    while i < len(lines):
+        line = lines[i].strip()
+
+        # Blank lines and HTML comments such as Docling's <!-- image --> placeholders
+        if not line or (line.startswith("<!--") and line.endswith("-->")):
+            i += 1
+            continue
+
+        # Pipe table: header row, separator row, body rows
+        if (
+            line.startswith("|")
+            and i + 1 < len(lines)
+            and MD_TABLE_SEPARATOR.match(lines[i + 1].strip())
+        ):
+            table_lines = [line]
+            i += 2
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                table_lines.append(lines[i].strip())
+                i += 1
+
+            grid = [_split_md_row(row) for row in table_lines]
+            num_rows = len(grid)
+            num_cols = max(len(row) for row in grid)
+
+            cells = [
+                {
+                    "item_type": "table_cell",
+                    "num_rows": num_rows,
+                    "num_cols": num_cols,
+                    "row": r,
+                    "col": c,
+                    "text": text,
+                }
+                for r, row in enumerate(grid)
+                for c, text in enumerate(row)
+                if text
+            ]
+            table_row = {
+                "item_type": "table",
+                "num_rows": num_rows,
+                "num_cols": num_cols,
+                "text": " ".join(cell["text"] for cell in cells),
+            }
+            yield table_row, cells
+            continue
+
+        if line.startswith("#"):
+            yield {"item_type": "section_header", "text": line.lstrip("#").strip()}, []
+        elif line.startswith(("- ", "* ")):
+            yield {"item_type": "list_item", "text": line[2:].strip()}, []
+        else:
+            yield {"item_type": "text", "text": line}, []
+        i += 1
+
+
+# Ingestion
+def _insert_item(conn, doc_id, row, parent_id=None):
+    cursor = conn.execute(
+        """
+        INSERT INTO items (doc_id, self_ref, parent_id, item_type, page_no,
+                           l, b, r, t, num_rows, num_cols, row, col, text)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            doc_id,
+            row.get("self_ref"),
+            parent_id,
+            row["item_type"],
+            row.get("page_no"),
+            row.get("l"),
+            row.get("b"),
+            row.get("r"),
+            row.get("t"),
+            row.get("num_rows"),
+            row.get("num_cols"),
+            row.get("row"),
+            row.get("col"),
+            row["text"],
+        ),
+    )
+    item_id = cursor.lastrowid
+    conn.execute("INSERT INTO items_fts (rowid, text) VALUES (?, ?)", (item_id, row["text"]))
+    if row.get("l") is not None:
+        conn.execute(
+            "INSERT INTO items_bbox (id, l, r, b, t) VALUES (?, ?, ?, ?, ?)",
+            (item_id, row["l"], row["r"], row["b"], row["t"]),
+        )
+    return item_id
+
+
+def _remove_document(conn, key: str):
+    for table, id_column in [("items_fts", "rowid"), ("items_bbox", "id")]:
+        conn.execute(
+            f"""
+            DELETE FROM {table} WHERE {id_column} IN (
+                SELECT items.id FROM items JOIN documents ON documents.id = items.doc_id
+                WHERE documents.key = ?
+            )
+            """,
+            (key,),
+        )
+    conn.execute("DELETE FROM documents WHERE key = ?", (key,))
+
+
+def load_items(path: Path):
+    """Return (format, item rows) for a serialized DoclingDocument or Markdown export"""
+    if path.suffix == ".json":
+        from docling_core.types.doc import DoclingDocument
+
+        document = DoclingDocument.load_from_json(path)
+        return "docling", items_from_docling(document)
+
+    return "markdown", items_from_markdown(path.read_text(encoding="utf-8"))
+
+
+def index_document(conn: sqlite3.Connection, path: str | Path) -> int | None:
+    """Add (or replace) one converted document in the index, returning its item count
+
+    Returns None when the file is skipped because the document's JSON is already indexed.
+    """
+    if isinstance(path, str):
+        path = Path(path)
+
+    doc_format, items = load_items(path)
+
+    # Documents are keyed by folder and stem, so same-named files in different
+    # folders are kept apart. A document converted to both JSON and Markdown in
+    # one folder is indexed once; the JSON carries page and bbox information,
+    # so it takes precedence
+    key = (path.resolve().parent / path.stem).as_posix()
+    existing = conn.execute(
+        "SELECT format FROM documents WHERE key = ?", (key,)
+    ).fetchone()
+    if existing and existing["format"] == "docling" and doc_format == "markdown":
+        return None
+
+    _remove_document(conn, key)
+    doc_id = conn.execute(
+        "INSERT INTO documents (key, name, source, format) VALUES (?, ?, ?, ?)",
+        (key, path.stem, path.as_posix(), doc_format),
+    ).lastrowid
+
+    count = 0
+    for row, children in items:
+        parent_id = _insert_item(conn, doc_id, row)
+        for child in children:
+            _insert_item(conn, doc_id, child, parent_id=parent_id)
+        count += 1 + len(children)
+
+    return count
+
+
+def build_index(sources: list[str | Path], index_path: str | Path = DEFAULT_INDEX_PATH):
+    """Index every .json / .md file found in the given files or directories"""
+
+    paths = []
+    for source in sources:
+        source = Path(source)
+        if source.is_dir():
+            # JSON first so Markdown duplicates are skipped
+            paths.extend(sorted(source.glob("*.json")))
+            paths.extend(sorted(source.glob("*.md")))
+        else:
+            paths.append(source)
+
+    conn = open_index(index_path)
+    with conn:
+        for path in paths:
+            # Roll back a failed file on its own so its partial rows aren't committed
+            conn.execute("SAVEPOINT doc")
+            try:
+                count = index_document(conn, path)
+            except Exception as e:
+                conn.execute("ROLLBACK TO doc")
+                conn.execute("RELEASE doc")
+                print(f"Error indexing {path.as_posix()}: {e}")
+                continue
+
+            conn.execute("RELEASE doc")
+            if count is None:
+                print(f"Skipped: {path.as_posix()} (JSON already indexed)")
+            else:
+                print(f"Indexed: {path.as_posix()} ({count} items)")
+
+        # Refresh planner statistics so page and region queries pick the right index
+        conn.execute("ANALYZE")
+    conn.close()
+
+
+# Querying
+def _fts_query(keywords: str) -> str:
+    """Quote each term so user input is matched literally (all terms must appear)"""
+    terms = keywords.split()
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _is_selective(conn, id_query: str, params: list) -> bool:
+    """Whether an id subquery matches few enough items to drive the search
+
+    Few matches are collected up front and looked up by id; for many matches it
+    is cheaper to walk items in result order and probe each one until the limit
+    is reached, instead of collecting and sorting every match.
+    """
+    count = conn.execute(
+        f"SELECT count(*) FROM ({id_query} LIMIT ?)", [*params, SELECTIVE_MATCH_LIMIT]
+    ).fetchone()[0]
+    return count < SELECTIVE_MATCH_LIMIT
+
+
+def search(
+    conn: sqlite3.Connection,
+    keywords: str | None = None,
+    item_types: list[str] | None = None,
+    pages: tuple[int, int] | None = None,
+    region: tuple[float, float, float, float] | None = None,
+    min_rows: int | None = None,
+    max_rows: int | None = None,
+    min_cols: int | None = None,
+    max_cols: int | None = None,
+    limit: int = 50,
+) -> list[sqlite3.Row]:
+    """Search the index combining keyword, item type, page range, region and table size criteria
+
+    region is (l, b, r, t) in bottom-left page coordinates; items overlapping it match.
+    """
+
+    clauses = []
+    params = []
+
+    if item_types:
+        clauses.append(f"i.item_type IN ({', '.join('?' * len(item_types))})")
+        params.extend(item_types)
+
+    if pages:
+        clauses.append("i.page_no BETWEEN ? AND ?")
+        params.extend(pages)
+
+    for column, op, value in [
+        ("num_rows", ">=", min_rows),
+        ("num_rows", "<=", max_rows),
+        ("num_cols", ">=", min_cols),
+        ("num_cols", "<=", max_cols),
+    ]:
+        if value is not None:
+            clauses.append(f"i.{column} {op} ?")
+            params.append(value)
+
+    # Keyword and region filters go last so the cheaper column checks run first
+    if keywords and keywords.split():
+        query = _fts_query(keywords)
+        match_ids = "SELECT rowid FROM items_fts WHERE items_fts MATCH ?"
+        match_item = "EXISTS (SELECT 1 FROM items_fts WHERE rowid = i.id AND items_fts MATCH ?)"
+        if _is_selective(conn, match_ids, [query]):
+            clauses.append(f"i.id IN ({match_ids})")
+        else:
+            clauses.append(match_item)
+        params.append(query)
+
+    if region:
+        l, b, r, t = region
+        overlap = "l < ? AND r > ? AND b < ? AND t > ?"
+        region_ids = f"SELECT id FROM items_bbox WHERE {overlap}"
+        if _is_selective(conn, region_ids, [r, l, t, b]):
+            clauses.append(f"i.id IN ({region_ids})")
+        else:
+            clauses.append(f"EXISTS (SELECT 1 FROM items_bbox WHERE id = i.id AND {overlap})")
+        params.extend([r, l, t, b])
+
+    where = " AND ".join(clauses) if clauses else "1"
+    params.append(limit)
+
+    return conn.execute(
+        f"""
+        SELECT d.name AS document, d.source, i.item_type, i.self_ref, i.page_no,
+               i.l, i.b, i.r, i.t, i.num_rows, i.num_cols, i.row, i.col, i.text
+        FROM items i JOIN documents d ON d.id = i.doc_id
+        WHERE {where}
+        ORDER BY d.name, d.key, i.page_no, i.id
+        LIMIT ?
+        """,
+        params,
+    ).fetchall()
+
+
+def _parse_pages(value: str) -> tuple[int, int]:
+    start, _, end = value.partition("-")
+    return int(start), int(end or start)
+
+
+def _parse_region(value: str) -> tuple[float, float, float, float]:
+    l, b, r, t = (float(v) for v in value.split(","))
+    return l, b, r, t
+
+
+def print_results(rows: list[sqlite3.Row]):
+    for row in rows:
+        location = f"page {row['page_no']}" if row["page_no"] is not None else "no page"
+        if row["l"] is not None:
+            location += f" [{row['l']:.0f},{row['b']:.0f},{row['r']:.0f},{row['t']:.0f}]"
+        if row["num_rows"] is not None:
+            location += f" {row['num_rows']}×{row['num_cols']}"
+        if row["row"] is not None:
+            location += f" cell ({row['row']},{row['col']})"
+
+        preview = row["text"][:60].replace("\n", " ")
+        print(f"{row['source']}: {row['item_type']} {location}: {preview}")
+
+    print(f"\n{len(rows)} result(s)")
+
+
+def cli_handler():
+    parser = argparse.ArgumentParser(
+        description="Index converted documents and search their text and tables"
+    )
+    parser.add_argument("--db", default=DEFAULT_INDEX_PATH, help="Path to the index file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = subparsers.add_parser(
+        "index", help="Index DoclingDocument JSON files and Markdown exports"
+    )
+    index_parser.add_argument(
+        "sources", nargs="+", help="Files or directories (e.g. output/) to index"
+    )
+
+    search_parser = subparsers.add_parser("search", help="Search the index")
+    search_parser.add_argument("keywords", nargs="?", help="Terms that must all appear")
+    search_parser.add_argument(
+        "--type",
+        action="append",
+        dest="item_types",
+        help="Item type, e.g. table, table_cell, text, section_header (repeatable)",
+    )
+    search_parser.add_argument("--pages", type=_parse_pages, help="Page range, e.g. 3-6")
+    search_parser.add_argument(
+        "--region",
+        type=_parse_region,
+        help="l,b,r,t box in bottom-left page points, e.g. 0,396,612,792 for the top half",
+    )
+    search_parser.add_argument("--min-rows", type=int)
+    search_parser.add_argument("--max-rows", type=int)
+    search_parser.add_argument("--min-cols", type=int)
+    search_parser.add_argument("--max-cols", type=int)
+    search_parser.add_argument("--limit", type=int, default=50)
+
+    args = parser.parse_args()
+
+    if args.command == "index":
+        build_index(args.sources, args.db)
+        return
+
+    conn = open_index(args.db)
+    rows = search(
+        conn,
+        keywords=args.keywords,
+        item_types=args.item_types,
+        pages=args.pages,
+        region=args.region,
+        min_rows=args.min_rows,
+        max_rows=args.max_rows,
+        min_cols=args.min_cols,
+        max_cols=args.max_cols,
+        limit=args.limit,
+    )
+    conn.close()
+    print_results(rows)
+
+
+if __name__ == "__main__":
+    cli_handler()
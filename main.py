@@ -4,7 +4,7 @@ from pathlib import Path
 from docling.document_converter import DocumentConverter
 
 
-def convert_document(source: str | Path):
+def convert_document(source: str | Path, save_json: bool = False):
     if isinstance(source, str):
         source = Path(source)
 
@@ -15,6 +15,10 @@ def convert_document(source: str | Path):
     
     with open("output/" + source.name.replace(".pdf", ".md"), "w", encoding="utf-8") as f:
         f.write(result.document.export_to_markdown())
+
+    # The serialized DoclingDocument keeps page and bbox provenance for corpus_index.py
+    if save_json:
+        result.document.save_as_json(Path("output/" + source.name.replace(".pdf", ".json")))
         
     print(f"Converted: {source.as_posix()}")
 
@@ -22,9 +26,12 @@ def convert_document(source: str | Path):
 def cli_handler():
     parser = argparse.ArgumentParser(description="Convert PDF documents to Markdown using Docling")
     parser.add_argument("document", help="Path to the PDF document to convert")
+    parser.add_argument(
+        "--json", action="store_true", help="Also save the DoclingDocument as JSON for indexing"
+    )
     
     args = parser.parse_args()
-    convert_document(args.document)
+    convert_document(args.document, save_json=args.json)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+import corpus_index
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# Top half of a US letter page in bottom-left points
+TOP_HALF = (0, 396, 612, 792)
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Copy of the fixture folder: layout.json + layout.md (same document) and filing.md"""
+    pytest.importorskip("docling_core")
+    folder = tmp_path / "output"
+    shutil.copytree(FIXTURES, folder)
+    return folder
+
+
+@pytest.fixture
+def index(corpus, tmp_path):
+    index_path = tmp_path / "index.db"
+    corpus_index.build_index([corpus], index_path)
+    conn = corpus_index.open_index(index_path)
+    yield conn
+    conn.close()
+
+
+def documents(conn):
+    return {
+        (row["name"], row["format"])
+        for row in conn.execute("SELECT name, format FROM documents")
+    }
+
+
+# Markdown parsing
+def test_markdown_items():
+    items = list(corpus_index.items_from_markdown((FIXTURES / "filing.md").read_text()))
+    rows = [row for row, _ in items]
+
+    assert [row["item_type"] for row in rows] == [
+        "section_header",
+        "list_item",
+        "list_item",
+        "table",
+    ]
+    assert rows[1]["text"] == "Industrial revenue up 4%"
+
+    table, cells = items[-1]
+    assert (table["num_rows"], table["num_cols"]) == (3, 4)
+    assert table["text"] == " ".join(cell["text"] for cell in cells)
+    # Empty cells are not indexed
+    assert len(cells) == 11
+    assert {"row": 2, "col": 0, "text": "Medical"}.items() <= cells[8].items()
+
+
+def test_markdown_skips_comment_placeholders():
+    rows = [row for row, _ in corpus_index.items_from_markdown("<!-- image -->\n\ntext\n")]
+    assert [row["text"] for row in rows] == ["text"]
+
+
+# DoclingDocument ingestion
+def test_docling_items_are_bottom_left():
+    docling_core = pytest.importorskip("docling_core.types.doc")
+    document = docling_core.DoclingDocument.load_from_json(FIXTURES / "layout.json")
+
+    items = list(corpus_index.items_from_docling(document))
+    rows = {row["text"]: row for row, _ in items}
+
+    assert rows["Page 2 of 2"]["item_type"] == "page_header"
+    heading = rows["Quarterly Results"]
+    assert heading["item_type"] == "section_header"
+    assert (heading["page_no"], heading["b"], heading["t"]) == (1, 740, 756)
+
+    table, cells = items[-1]
+    assert (table["page_no"], table["num_rows"], table["num_cols"]) == (2, 3, 3)
+    # TableFormer-style top-left cell boxes are flipped with the page height
+    revenue = next(cell for cell in cells if cell["text"] == "Revenue")
+    assert (revenue["b"], revenue["t"]) == (792 - 154, 792 - 140)
+    assert table["b"] <= revenue["b"] < revenue["t"] <= table["t"]
+
+
+def test_docling_top_left_box_without_page_size_is_dropped():
+    docling_core = pytest.importorskip("docling_core.types.doc")
+    document = docling_core.DoclingDocument.load_from_json(FIXTURES / "layout.json")
+    document.pages.clear()
+
+    table, cells = list(corpus_index.items_from_docling(document))[-1]
+
+    # Bottom-left boxes don't need the page height
+    assert table["t"] == 680
+    assert all("l" not in cell for cell in cells)
+
+
+# Building the index
+def test_json_takes_precedence_over_markdown(index):
+    assert documents(index) == {("layout", "docling"), ("filing", "markdown")}
+
+
+def test_same_stem_in_different_folders(corpus, tmp_path):
+    other = tmp_path / "other"
+    other.mkdir()
+    shutil.copy(corpus / "filing.md", other / "filing.md")
+
+    index_path = tmp_path / "index.db"
+    corpus_index.build_index([corpus, other], index_path)
+    conn = corpus_index.open_index(index_path)
+
+    sources = [row["source"] for row in corpus_index.search(conn, keywords="segment update")]
+    assert sorted(sources) == sorted(
+        [(corpus / "filing.md").as_posix(), (other / "filing.md").as_posix()]
+    )
+
+
+def test_failed_document_rolls_back(corpus, tmp_path, monkeypatch, capsys):
+    index_path = tmp_path / "index.db"
+    corpus_index.build_index([corpus], index_path)
+
+    conn = corpus_index.open_index(index_path)
+    before = conn.execute("SELECT count(*) FROM items").fetchone()[0]
+    conn.close()
+
+    # Fail filing.md partway through, after its old rows were removed
+    items_from_markdown = corpus_index.items_from_markdown
+
+    def failing(markdown):
+        for n, item in enumerate(items_from_markdown(markdown)):
+            if n == 2:
+                raise ValueError("boom")
+            yield item
+
+    monkeypatch.setattr(corpus_index, "items_from_markdown", failing)
+    (corpus / "broken.json").write_text("{not json")
+    shutil.copy(corpus / "layout.json", corpus / "copy.json")
+
+    corpus_index.build_index([corpus], index_path)
+    output = capsys.readouterr().out
+    assert f"Error indexing {(corpus / 'broken.json').as_posix()}" in output
+    assert f"Error indexing {(corpus / 'filing.md').as_posix()}: boom" in output
+    assert "Skipped:" in output and "layout.md" in output
+
+    conn = corpus_index.open_index(index_path)
+    assert documents(conn) == {
+        ("layout", "docling"),
+        ("copy", "docling"),
+        ("filing", "markdown"),
+    }
+    # filing.md keeps its previous rows; copy.json adds as many as layout.json
+    layout = conn.execute(
+        "SELECT count(*) FROM items i JOIN documents d ON d.id = i.doc_id WHERE d.name = 'layout'"
+    ).fetchone()[0]
+    total = conn.execute("SELECT count(*) FROM items").fetchone()[0]
+    fts = conn.execute("SELECT count(*) FROM items_fts").fetchone()[0]
+    assert total == before + layout == fts
+    conn.close()
+
+
+# Searching
+def test_search_pages_and_type(index):
+    rows = corpus_index.search(index, item_types=["table"], pages=(2, 3))
+    assert [(row["document"], row["page_no"]) for row in rows] == [("layout", 2)]
+
+
+def test_search_region(index):
+    rows = corpus_index.search(index, region=(0, 0, 612, 100))
+    assert [row["text"] for row in rows] == ["Footnote on adjusted EBITDA"]
+
+    rows = corpus_index.search(index, item_types=["table_cell"], region=TOP_HALF, pages=(2, 2))
+    assert len(rows) == 9
+
+
+def test_search_keyword_and_table_size(index):
+    rows = corpus_index.search(index, keywords="adjusted ebitda", item_types=["table"], min_cols=3)
+    assert [row["document"] for row in rows] == ["layout"]
+
+    assert corpus_index.search(index, keywords="adjusted ebitda", min_cols=4) == []
+
+    rows = corpus_index.search(index, keywords="industrial", item_types=["table"], min_cols=4)
+    assert [row["document"] for row in rows] == ["filing"]
+
+
+def test_search_whitespace_keywords(index):
+    assert len(corpus_index.search(index, keywords="   ")) == len(corpus_index.search(index))
+
+
+@pytest.mark.parametrize(
+    "criteria",
+    [
+        {"keywords": "revenue"},
+        {"keywords": "ebitda", "item_types": ["table"]},
+        {"region": TOP_HALF},
+        {"region": TOP_HALF, "pages": (2, 2), "item_types": ["table_cell"]},
+    ],
+)
+def test_selective_and_per_item_paths_agree(index, monkeypatch, criteria):
+    monkeypatch.setattr(corpus_index, "SELECTIVE_MATCH_LIMIT", 10**9)
+    selective = [tuple(row) for row in corpus_index.search(index, **criteria)]
+
+    monkeypatch.setattr(corpus_index, "SELECTIVE_MATCH_LIMIT", 1)
+    per_item = [tuple(row) for row in corpus_index.search(index, **criteria)]
+
+    assert selective and selective == per_item